@@ -1,11 +1,12 @@
 import io
+import json
+from itertools import chain, repeat
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill
-from openpyxl.utils import get_column_letter
-from openpyxl.utils.dataframe import dataframe_to_rows
+
+from fast_xlsx import ILLEGAL_CHARACTERS_RE, column_letter, write_workbook
 
 # ================= Page setup =================
 st.set_page_config(
@@ -36,26 +37,43 @@ DEFAULTS = {
     "bin_library": {},   # {bin_id: {fields}}
     "next_bin_id": 1,
     "next_group_id": 1,
+    "xlsx_bytes": None,     # last prepared export
+    "xlsx_snapshot": None,  # export_snapshot() the bytes were built from
 }
 for key, value in DEFAULTS.items():
     if key not in st.session_state:
         st.session_state[key] = value
 
 # ================= Constants =================
-EXPORT_COLUMNS = [
+EXPORT_COLUMNS = (
     "Group Name", "Floor", "Mod", "Depth", "Start Aisle", "End Aisle", "# of Aisles", "# of Bays",
     "Total # of Shelves per Bay", "Bay Design", "Bin Box Type", "Depth (mm)",
     "Height (mm)", "Width (mm)", "Lip (cm)", "# of Shelves per Bay",
     "Qty bins per Shelf", "Qty Per Bay", "Total Quantity", "UT",
     "Bin Gross CBM", "Bin Net CBM",
-]
+)
+
+# Leading columns taken from (or derived from) the group; the rest come from the bin
+GROUP_COLS = EXPORT_COLUMNS[:EXPORT_COLUMNS.index("Bin Box Type")]
 
 # Columns that describe the group (merged in the Excel export)
 GROUP_MERGE_COLS = 9
 
+# Excel column letter for each export column
+COL_LETTERS = tuple(column_letter(i) for i in range(1, len(EXPORT_COLUMNS) + 1))
+
+# Exports with more rows than this bypass openpyxl (see fast_xlsx.py)
+FAST_XLSX_MIN_ROWS = 500
+
 
 # ================= Helpers =================
 def safe_float(x, default=0.0):
+    # Widgets hand back plain floats/ints; skip the try/except for those
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
     try:
         return float(x)
     except (TypeError, ValueError):
@@ -66,37 +84,9 @@ def safe_int(x, default=0):
     return int(safe_float(x, default))
 
 
-def calculate_fields(group_data: dict, bin_data: dict) -> dict:
-    """Derive computed bin fields for a (group, bin) pairing.
-
-    Domain rules preserved from the original tool:
-      - # of Aisles  = End Aisle - Start Aisle + 1
-      - Qty Per Bay  = shelves per bay * bins per shelf
-      - Total Qty    = Qty Per Bay * # of Bays
-      - Gross CBM    = depth * height * width / 1,000,000
-      - Net CBM      = Gross CBM * UT
-    """
-    g, b = group_data, bin_data
-    out = {**b}
-
-    shelves_per_bay = safe_int(b.get("# of Shelves per Bay", 1), 1)
-    qty_per_shelf = safe_int(b.get("Qty bins per Shelf", 1), 1)
-    ut = safe_float(b.get("UT", 0.0))
-    depth_mm = safe_float(b.get("Depth (mm)", 0.0))
-    height_mm = safe_float(b.get("Height (mm)", 0.0))
-    width_mm = safe_float(b.get("Width (mm)", 0.0))
-    lip_cm = safe_float(b.get("Lip (cm)", 0.0))
-    start_aisle = safe_int(g.get("Start Aisle", 1), 1)
-    end_aisle = safe_int(g.get("End Aisle", 1), 1)
-    bays = safe_int(g.get("# of Bays", 1), 1)
-
-    out["Lip (cm)"] = "-" if lip_cm == 0 else round(lip_cm, 2)
-    out["# of Aisles"] = end_aisle - start_aisle + 1
-    out["Qty Per Bay"] = shelves_per_bay * qty_per_shelf
-    out["Total Quantity"] = out["Qty Per Bay"] * bays
-    out["Bin Gross CBM"] = round((depth_mm * height_mm * width_mm) / 1_000_000, 4)
-    out["Bin Net CBM"] = round(out["Bin Gross CBM"] * ut, 4)
-    return out
+def clean_cell(value):
+    """Strip control characters Excel can't store from text; other values pass through."""
+    return ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
 
 
 def sync_bin_keys_with_library():
@@ -106,6 +96,17 @@ def sync_bin_keys_with_library():
         grp["bin_keys"] = [k for k in grp.get("bin_keys", []) if k in valid_ids]
 
 
+def export_snapshot() -> str:
+    """Serialise what the export depends on: group data, bin keys and the bins they use.
+
+    Used as the export cache key and to tell if a prepared file is stale.
+    """
+    library = st.session_state.bin_library
+    groups = [(g["group_data"], g.get("bin_keys", [])) for g in st.session_state.groups]
+    used_bins = {k: library[k] for _, keys in groups for k in keys if k in library}
+    return json.dumps([groups, used_bins], sort_keys=True, default=str)
+
+
 def rerun():
     try:
         st.rerun()
@@ -117,69 +118,190 @@ def bin_label(data: dict, fallback: str) -> str:
     return (data.get("Bin Box Type") or "").strip() or fallback
 
 
-def build_spec_dataframe(groups: list):
-    """Build the full spec DataFrame and the per-group row counts (for merging)."""
-    rows = []
+def calculate_columns(group_data: list, group_row_counts: list, bins: list) -> dict:
+    """Derive the computed bin fields for every row of the spec.
+
+    `group_data[i]` owns the next `group_row_counts[i]` entries of `bins`
+    (one bin dict per row). Group inputs are coerced once per group and
+    repeated across its rows. Returns {column: [values aligned with bins]}.
+
+    Domain rules preserved from the original tool:
+      - # of Aisles  = End Aisle - Start Aisle + 1
+      - Qty Per Bay  = shelves per bay * bins per shelf
+      - Total Qty    = Qty Per Bay * # of Bays
+      - Gross CBM    = depth * height * width / 1,000,000
+      - Net CBM      = Gross CBM * UT
+    """
+    def ints(rows, key):
+        return np.array([safe_int(r.get(key, 1), 1) for r in rows], dtype=np.int64)
+
+    def floats(rows, key):
+        return np.array([safe_float(r.get(key, 0.0)) for r in rows], dtype=np.float64)
+
+    shelves_per_bay = ints(bins, "# of Shelves per Bay")
+    qty_per_shelf = ints(bins, "Qty bins per Shelf")
+    ut = floats(bins, "UT")
+    depth_mm = floats(bins, "Depth (mm)")
+    height_mm = floats(bins, "Height (mm)")
+    width_mm = floats(bins, "Width (mm)")
+    lip_cm = floats(bins, "Lip (cm)")
+
+    num_aisles = ints(group_data, "End Aisle") - ints(group_data, "Start Aisle") + 1
+    num_aisles = np.repeat(num_aisles, group_row_counts)
+    bays = np.repeat(ints(group_data, "# of Bays"), group_row_counts)
+
+    # Arithmetic is vectorised; rounding uses Python's round() to keep the
+    # original tool's results (np.round differs on some ties).
+    qty_per_bay = shelves_per_bay * qty_per_shelf
+    gross = np.array(
+        [round(v, 4) for v in (depth_mm * height_mm * width_mm / 1_000_000).tolist()],
+        dtype=np.float64,
+    )
+
+    return {
+        "Lip (cm)": ["-" if v == 0 else round(v, 2) for v in lip_cm.tolist()],
+        "# of Aisles": num_aisles.tolist(),
+        "Qty Per Bay": qty_per_bay.tolist(),
+        "Total Quantity": (qty_per_bay * bays).tolist(),
+        "Bin Gross CBM": gross.tolist(),
+        "Bin Net CBM": [round(v, 4) for v in (gross * ut).tolist()],
+    }
+
+
+def build_spec_columns(groups: list, library: dict):
+    """Build the spec as one value list per EXPORT_COLUMNS entry, plus per-group row counts."""
+    group_data = []
     group_row_counts = []
-    library = st.session_state.bin_library
+    bins = []
 
     for group in groups:
-        group_data = group["group_data"]
         added = 0
         for k in group.get("bin_keys", []):
             base_bin = library.get(k)
             if base_bin is None:
                 continue
-            calc = calculate_fields(group_data, base_bin)
-            row = {**group_data, **calc}
-            rows.append({c: row.get(c, None) for c in EXPORT_COLUMNS})
+            bins.append(base_bin)
             added += 1
+        group_data.append(group["group_data"])
         group_row_counts.append(added)
 
-    df = pd.DataFrame(rows, columns=EXPORT_COLUMNS)
+    # Assemble column by column straight from the source dicts, without
+    # building a merged dict per row. Group values are read once per group
+    # and repeated over that group's rows.
+    calc = calculate_columns(group_data, group_row_counts, bins)
+    columns = []
+    for c in EXPORT_COLUMNS:
+        if c in calc:
+            columns.append(calc[c])
+        elif c in GROUP_COLS:
+            columns.append(list(chain.from_iterable(
+                repeat(clean_cell(g.get(c)), n) for g, n in zip(group_data, group_row_counts)
+            )))
+        else:
+            columns.append([clean_cell(b.get(c)) for b in bins])
+
+    return columns, group_row_counts
+
+
+def build_spec_dataframe(groups: list, library: dict):
+    """Build the full spec DataFrame and the per-group row counts (for merging)."""
+    columns, group_row_counts = build_spec_columns(groups, library)
+    df = pd.DataFrame(dict(zip(EXPORT_COLUMNS, columns)), columns=EXPORT_COLUMNS)
     return df, group_row_counts
 
 
 # ================= Excel export =================
-def generate_excel(groups: list) -> bytes:
-    df, group_row_counts = build_spec_dataframe(groups)
+def column_widths(columns: list) -> list:
+    """Auto-size each export column to its longest value, capped for readability."""
+    widths = []
+    for col_name, values in zip(EXPORT_COLUMNS, columns):
+        max_len = max(len(col_name), max(map(len, map(str, values)), default=0))
+        widths.append(min(max_len + 2, 40))
+    return widths
 
-    output = io.BytesIO()
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Bin Box"
-
-    header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-    for r_idx, r in enumerate(dataframe_to_rows(df, index=False, header=True), 1):
-        ws.append(r)
-        if r_idx == 1:
-            for cell in ws[r_idx]:
-                cell.font = Font(bold=True)
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal="center", vertical="center")
 
-    ws.freeze_panes = "A2"
+@st.cache_data(show_spinner=False, max_entries=4)
+def excel_from_snapshot(snapshot: str) -> bytes:
+    """Cached generate_excel for an export_snapshot() string.
+
+    Streamlit only has to hash one string to find a previous export, instead
+    of walking the nested groups and library on every call.
+    """
+    groups, library = json.loads(snapshot)
+    return generate_excel(
+        [{"group_data": group_data, "bin_keys": bin_keys} for group_data, bin_keys in groups],
+        library,
+    )
+
 
-    # Merge the group-level columns across each group's rows
+def generate_excel(groups: list, library: dict) -> bytes:
+    """Write the spec to an .xlsx file and return its bytes.
+
+    Write-only sheets stream rows straight to XML, so column widths and the
+    frozen header are set up front and merged ranges are registered while the
+    rows are appended.
+    """
+    # Widths are measured on the columns before they're zipped into rows
+    columns, group_row_counts = build_spec_columns(groups, library)
+    widths = column_widths(columns)
+    rows = list(zip(*columns))
+
+    # Large exports skip openpyxl and emit the sheet XML directly
+    if len(rows) > FAST_XLSX_MIN_ROWS:
+        return write_workbook(
+            EXPORT_COLUMNS, rows, group_row_counts, GROUP_MERGE_COLS, widths, title="Bin Box"
+        )
+
+    # openpyxl is only loaded once a small export is actually prepared
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    header_font = Font(bold=True)
+    header_fill = PatternFill(start_color="FFD3D3D3", end_color="FFD3D3D3", fill_type="solid")
+    center = Alignment(horizontal="center", vertical="center")
+
+    output = io.BytesIO()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Bin Box")
+    ws.freeze_panes = "A2"
+    for letter, width in zip(COL_LETTERS, widths):
+        ws.column_dimensions[letter].width = width
+
+    header = []
+    for col_name in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = center
+        header.append(cell)
+    ws.append(header)
+
+    # Merge the group-level columns across each group's rows; only the first
+    # row of a group carries the values, centred in the merged block.
+    merge_letters = COL_LETTERS[:GROUP_MERGE_COLS]
     current_row = 2
+    start = 0
     for row_count in group_row_counts:
-        if row_count > 0:
-            for col_idx in range(1, GROUP_MERGE_COLS + 1):
-                ws.merge_cells(
-                    start_row=current_row, start_column=col_idx,
-                    end_row=current_row + row_count - 1, end_column=col_idx,
-                )
-                ws.cell(row=current_row, column=col_idx).alignment = Alignment(
-                    horizontal="center", vertical="center"
-                )
-            current_row += row_count
-
-    # Auto-size columns for readability
-    for col_idx, col_name in enumerate(EXPORT_COLUMNS, 1):
-        max_len = len(str(col_name))
-        for value in df[col_name].astype(str):
-            max_len = max(max_len, len(value))
-        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 2, 40)
+        if row_count == 0:
+            continue
+        end_row = current_row + row_count - 1
+        for letter in merge_letters:
+            ws.merged_cells.add(f"{letter}{current_row}:{letter}{end_row}")
+
+        for offset, row in enumerate(rows[start:start + row_count]):
+            if offset == 0:
+                lead = []
+                for value in row[:GROUP_MERGE_COLS]:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.alignment = center
+                    lead.append(cell)
+            else:
+                lead = [None] * GROUP_MERGE_COLS
+            ws.append(lead + list(row[GROUP_MERGE_COLS:]))
+
+        start += row_count
+        current_row = end_row + 1
 
     wb.save(output)
     output.seek(0)
@@ -187,8 +309,7 @@ def generate_excel(groups: list) -> bytes:
 
 
 # ================= Sidebar: summary =================
-def render_summary():
-    df, _ = build_spec_dataframe(st.session_state.groups)
+def render_summary(df):
     total_qty = int(df["Total Quantity"].fillna(0).sum()) if not df.empty else 0
     total_net = float(df["Bin Net CBM"].fillna(0).sum()) if not df.empty else 0.0
 
@@ -224,6 +345,15 @@ def add_bin(seed: dict | None = None):
     return new_id
 
 
+def bin_readouts(library: dict) -> dict:
+    """Gross/Net CBM per bin id, computed for the whole library in one calculate_columns call."""
+    calc = calculate_columns([{}], [len(library)], list(library.values()))
+    return {
+        bin_id: (gross, net)
+        for bin_id, gross, net in zip(library, calc["Bin Gross CBM"], calc["Bin Net CBM"])
+    }
+
+
 def render_bin_library():
     st.subheader("Bin Box Library")
     st.write("Define each bin type once. They become available to every group.")
@@ -236,57 +366,63 @@ def render_bin_library():
         st.info("No bin types yet. Add one to get started.")
         return
 
+    readouts = bin_readouts(st.session_state.bin_library)
     for bin_id, data in list(st.session_state.bin_library.items()):
         label = bin_label(data, bin_id)
         with st.expander(label, expanded=False):
-            c1, c2 = st.columns(2)
-            with c1:
-                data["Bin Box Type"] = st.text_input(
-                    "Bin Box Type", value=data.get("Bin Box Type", ""), key=f"name_{bin_id}"
-                )
-                data["Depth (mm)"] = st.number_input(
-                    "Depth (mm)", min_value=0.0, value=safe_float(data.get("Depth (mm)")),
-                    step=0.1, key=f"depth_{bin_id}",
-                )
-                data["Height (mm)"] = st.number_input(
-                    "Height (mm)", min_value=0.0, value=safe_float(data.get("Height (mm)")),
-                    step=0.1, key=f"height_{bin_id}",
-                )
-                has_lip = st.checkbox(
-                    "Has lip?", value=safe_float(data.get("Lip (cm)")) > 0, key=f"lip_chk_{bin_id}"
-                )
-            with c2:
-                data["Width (mm)"] = st.number_input(
-                    "Width (mm)", min_value=0.0, value=safe_float(data.get("Width (mm)")),
-                    step=0.1, key=f"width_{bin_id}",
-                )
-                data["Lip (cm)"] = (safe_float(data["Height (mm)"]) * 0.2 / 10) if has_lip else 0.0
-                st.number_input(
-                    "Lip (cm) — auto", value=safe_float(data["Lip (cm)"]),
-                    disabled=True, key=f"lip_val_{bin_id}",
-                )
-                data["# of Shelves per Bay"] = int(st.number_input(
-                    "# of Shelves per Bay", min_value=1,
-                    value=safe_int(data.get("# of Shelves per Bay", 1), 1),
-                    step=1, key=f"shelves_{bin_id}",
-                ))
-                data["Qty bins per Shelf"] = int(st.number_input(
-                    "Qty bins per Shelf", min_value=1,
-                    value=safe_int(data.get("Qty bins per Shelf", 1), 1),
-                    step=1, key=f"qty_{bin_id}",
-                ))
-                data["UT"] = st.number_input(
-                    "UT (0-1)", min_value=0.0, max_value=1.0,
-                    value=min(max(safe_float(data.get("UT")), 0.0), 1.0),
-                    step=0.01, key=f"ut_{bin_id}",
-                )
-
-            # Live per-bin volume readout
-            gross = (safe_float(data["Depth (mm)"]) * safe_float(data["Height (mm)"])
-                     * safe_float(data["Width (mm)"])) / 1_000_000
-            mc1, mc2 = st.columns(2)
+            # Edits are batched in a form and only applied on Save, so typing
+            # doesn't rerun the whole app.
+            with st.form(f"bin_form_{bin_id}"):
+                edits = {}
+                c1, c2 = st.columns(2)
+                with c1:
+                    edits["Bin Box Type"] = st.text_input(
+                        "Bin Box Type", value=data.get("Bin Box Type", ""), key=f"name_{bin_id}"
+                    )
+                    edits["Depth (mm)"] = st.number_input(
+                        "Depth (mm)", min_value=0.0, value=safe_float(data.get("Depth (mm)")),
+                        step=0.1, key=f"depth_{bin_id}",
+                    )
+                    edits["Height (mm)"] = st.number_input(
+                        "Height (mm)", min_value=0.0, value=safe_float(data.get("Height (mm)")),
+                        step=0.1, key=f"height_{bin_id}",
+                    )
+                    has_lip = st.checkbox(
+                        "Has lip?", value=safe_float(data.get("Lip (cm)")) > 0, key=f"lip_chk_{bin_id}",
+                        help="The lip is set to 20% of the height when you save.",
+                    )
+                with c2:
+                    edits["Width (mm)"] = st.number_input(
+                        "Width (mm)", min_value=0.0, value=safe_float(data.get("Width (mm)")),
+                        step=0.1, key=f"width_{bin_id}",
+                    )
+                    edits["# of Shelves per Bay"] = int(st.number_input(
+                        "# of Shelves per Bay", min_value=1,
+                        value=safe_int(data.get("# of Shelves per Bay", 1), 1),
+                        step=1, key=f"shelves_{bin_id}",
+                    ))
+                    edits["Qty bins per Shelf"] = int(st.number_input(
+                        "Qty bins per Shelf", min_value=1,
+                        value=safe_int(data.get("Qty bins per Shelf", 1), 1),
+                        step=1, key=f"qty_{bin_id}",
+                    ))
+                    edits["UT"] = st.number_input(
+                        "UT (0-1)", min_value=0.0, max_value=1.0,
+                        value=min(max(safe_float(data.get("UT")), 0.0), 1.0),
+                        step=0.01, key=f"ut_{bin_id}",
+                    )
+
+                if st.form_submit_button("💾 Save"):
+                    edits["Lip (cm)"] = (safe_float(edits["Height (mm)"]) * 0.2 / 10) if has_lip else 0.0
+                    data.update(edits)
+                    rerun()
+
+            # Lip and volume readout for the saved values
+            gross, net = readouts[bin_id]
+            mc0, mc1, mc2 = st.columns(3)
+            mc0.metric("Lip (cm)", f"{safe_float(data.get('Lip (cm)')):.2f}")
             mc1.metric("Gross CBM", f"{gross:.4f}")
-            mc2.metric("Net CBM", f"{gross * safe_float(data.get('UT')):.4f}")
+            mc2.metric("Net CBM", f"{net:.4f}")
 
             b1, b2 = st.columns(2)
             if b1.button("📄 Duplicate", key=f"dup_{bin_id}"):
@@ -344,47 +480,55 @@ def render_groups():
         state = "✅ Finalized" if group["finalized"] else "✏️ Editing"
         with st.expander(f"Group {group_idx + 1}: {title} ({state})", expanded=not group["finalized"]):
             if not group["finalized"]:
-                c1, c2 = st.columns(2)
-                with c1:
-                    gd["Group Name"] = st.text_input("Group Name", value=gd["Group Name"], key=f"gname_{group_idx}")
-                    gd["Floor"] = st.text_input("Floor", value=gd["Floor"], key=f"gflr_{group_idx}")
-                    gd["Mod"] = st.text_input("Mod", value=gd["Mod"], key=f"gmod_{group_idx}")
-                    gd["Depth"] = st.text_input("Depth", value=gd["Depth"], key=f"gdepth_{group_idx}")
-                with c2:
-                    gd["Start Aisle"] = int(st.number_input(
-                        "Start Aisle", min_value=1, value=safe_int(gd["Start Aisle"], 1),
-                        step=1, key=f"gstart_{group_idx}"))
-                    gd["End Aisle"] = int(st.number_input(
-                        "End Aisle", min_value=1, value=safe_int(gd["End Aisle"], 1),
-                        step=1, key=f"gend_{group_idx}"))
-                    gd["# of Bays"] = int(st.number_input(
-                        "# of Bays", min_value=1, value=safe_int(gd["# of Bays"], 1),
-                        step=1, key=f"gbays_{group_idx}"))
-                    gd["Total # of Shelves per Bay"] = int(st.number_input(
-                        "Total # of Shelves per Bay", min_value=1,
-                        value=safe_int(gd["Total # of Shelves per Bay"], 1),
-                        step=1, key=f"gshelves_{group_idx}"))
-                    gd["Bay Design"] = st.text_input("Bay Design", value=gd["Bay Design"], key=f"gbay_{group_idx}")
+                with st.form(f"group_form_{group_idx}"):
+                    edits = {}
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        edits["Group Name"] = st.text_input("Group Name", value=gd["Group Name"], key=f"gname_{group_idx}")
+                        edits["Floor"] = st.text_input("Floor", value=gd["Floor"], key=f"gflr_{group_idx}")
+                        edits["Mod"] = st.text_input("Mod", value=gd["Mod"], key=f"gmod_{group_idx}")
+                        edits["Depth"] = st.text_input("Depth", value=gd["Depth"], key=f"gdepth_{group_idx}")
+                    with c2:
+                        edits["Start Aisle"] = int(st.number_input(
+                            "Start Aisle", min_value=1, value=safe_int(gd["Start Aisle"], 1),
+                            step=1, key=f"gstart_{group_idx}"))
+                        edits["End Aisle"] = int(st.number_input(
+                            "End Aisle", min_value=1, value=safe_int(gd["End Aisle"], 1),
+                            step=1, key=f"gend_{group_idx}"))
+                        edits["# of Bays"] = int(st.number_input(
+                            "# of Bays", min_value=1, value=safe_int(gd["# of Bays"], 1),
+                            step=1, key=f"gbays_{group_idx}"))
+                        edits["Total # of Shelves per Bay"] = int(st.number_input(
+                            "Total # of Shelves per Bay", min_value=1,
+                            value=safe_int(gd["Total # of Shelves per Bay"], 1),
+                            step=1, key=f"gshelves_{group_idx}"))
+                        edits["Bay Design"] = st.text_input("Bay Design", value=gd["Bay Design"], key=f"gbay_{group_idx}")
+
+                    default_vals = [k for k in group.get("bin_keys", []) if k in available_ids]
+                    bin_keys = st.multiselect(
+                        "Bin Box Types for this group", options=available_ids, default=default_vals,
+                        format_func=lambda k: labels[k], key=f"binsel_{group_idx}",
+                    )
+
+                    f1, f2 = st.columns(2)
+                    save = f1.form_submit_button("💾 Save")
+                    finalize = f2.form_submit_button("✅ Save & finalize")
+                    if save or finalize:
+                        gd.update(edits)
+                        group["bin_keys"] = bin_keys
+                        group["finalized"] = finalize
+                        rerun()
 
                 if gd["End Aisle"] < gd["Start Aisle"]:
                     st.error("End Aisle must be greater than or equal to Start Aisle.")
-
-                default_vals = [k for k in group.get("bin_keys", []) if k in available_ids]
-                group["bin_keys"] = st.multiselect(
-                    "Bin Box Types for this group", options=available_ids, default=default_vals,
-                    format_func=lambda k: labels[k], key=f"binsel_{group_idx}",
-                )
                 if not group["bin_keys"]:
                     st.caption("⚠️ This group has no bins assigned and won't appear in the export.")
 
-                b1, b2, b3 = st.columns(3)
-                if b1.button("✅ Finalize", key=f"gfin_{group_idx}"):
-                    group["finalized"] = True
-                    rerun()
-                if b2.button("📄 Duplicate", key=f"gdup_{group_idx}"):
+                b1, b2 = st.columns(2)
+                if b1.button("📄 Duplicate", key=f"gdup_{group_idx}"):
                     add_group(group)
                     rerun()
-                if b3.button("🗑️ Delete", key=f"gdel_{group_idx}"):
+                if b2.button("🗑️ Delete", key=f"gdel_{group_idx}"):
                     delete_idx = group_idx
             else:
                 summary = ", ".join(labels.get(k, k) for k in group["bin_keys"]) or "no bins"
@@ -402,10 +546,8 @@ def render_groups():
 
 
 # ================= Tab 3: Preview & Export =================
-def render_preview_export():
+def render_preview_export(df):
     st.subheader("Preview & Export")
-    sync_bin_keys_with_library()
-    df, _ = build_spec_dataframe(st.session_state.groups)
 
     if df.empty:
         st.info("Nothing to preview yet. Add bin types and groups, then assign bins to groups.")
@@ -418,10 +560,24 @@ def render_preview_export():
 
     st.dataframe(df, use_container_width=True, hide_index=True)
 
-    excel_data = generate_excel(st.session_state.groups)
+    # Only build the workbook on request. A prepared file is reused while its
+    # snapshot matches and dropped as soon as the groups or bins change.
+    snapshot = export_snapshot()
+    if st.session_state.xlsx_snapshot != snapshot:
+        st.session_state.xlsx_bytes = None
+
+    prepare = st.button("🛠️ Prepare Excel file", use_container_width=True)
+    if prepare and st.session_state.xlsx_bytes is None:
+        st.session_state.xlsx_bytes = excel_from_snapshot(snapshot)
+        st.session_state.xlsx_snapshot = snapshot
+
+    if st.session_state.xlsx_bytes is None:
+        st.caption("Prepare the Excel file to download the current spec.")
+        return
+
     st.download_button(
         label="⬇️ Download Excel file",
-        data=excel_data,
+        data=st.session_state.xlsx_bytes,
         file_name="Bin_Divider_Specs.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         use_container_width=True,
@@ -430,7 +586,10 @@ def render_preview_export():
 
 # ================= Layout =================
 sync_bin_keys_with_library()
-render_summary()
+# Built once per rerun and shared by the sidebar and the preview tab. Every
+# edit ends in rerun(), so the data can't change between the two renders.
+spec_df, _ = build_spec_dataframe(st.session_state.groups, st.session_state.bin_library)
+render_summary(spec_df)
 
 tab_library, tab_groups, tab_export = st.tabs(
     ["📦 Bin Library", "🏢 Groups", "📊 Preview & Export"]
@@ -440,4 +599,4 @@ with tab_library:
 with tab_groups:
     render_groups()
 with tab_export:
-    render_preview_export()
+    render_preview_export(spec_df)
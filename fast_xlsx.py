@@ -0,0 +1,189 @@
+"""Minimal .xlsx writer for the single-sheet Bin Box export.
+
+The spec sheet always has the same shape (one styled header row, plain data
+rows, a few merged group blocks), so for large exports the sheet XML is
+assembled directly from string fragments and zipped, skipping the per-cell
+object overhead of a full Excel library.
+"""
+import io
+import math
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+# Characters that are not allowed in XML 1.0 documents
+ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+# cellXfs indices defined in STYLES_XML
+STYLE_HEADER = 1
+STYLE_CENTER = 2
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{title}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Default style, bold + gray centred header, centred group cell
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD3D3D3"/><bgColor rgb="FFD3D3D3"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def column_letter(col_idx: int) -> str:
+    """1 -> A, 27 -> AA."""
+    letters = ""
+    while col_idx > 0:
+        col_idx, rem = divmod(col_idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell_xml(ref: str, value, style: int = 0) -> str:
+    s = f' s="{style}"' if style else ""
+    if value is None or value == "":
+        return f'<c r="{ref}"{s}/>' if style else ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{s} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        # Same formatting as openpyxl: 16 significant digits, NaN/inf left blank
+        number = "%.16g" % value if math.isfinite(value) else ""
+        return f'<c r="{ref}"{s}><v>{number}</v></c>'
+    text = escape(str(value))
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}"{s} t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def _sheet_xml(header, rows, group_row_counts, merge_cols, widths) -> str:
+    letters = [column_letter(i) for i in range(1, len(header) + 1)]
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">',
+        f'<dimension ref="A1:{letters[-1]}{len(rows) + 1}"/>',
+        '<sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+        '</sheetView></sheetViews>',
+        '<sheetFormatPr defaultRowHeight="15"/>',
+        "<cols>",
+    ]
+    for col_idx, width in enumerate(widths, 1):
+        parts.append(f'<col min="{col_idx}" max="{col_idx}" width="{width}" customWidth="1"/>')
+    parts.append("</cols><sheetData>")
+
+    parts.append('<row r="1">')
+    for letter, value in zip(letters, header):
+        parts.append(_cell_xml(f"{letter}1", value, STYLE_HEADER))
+    parts.append("</row>")
+
+    # Rows that start a group get centred group cells; the rest of the block
+    # is covered by the merge and left empty. The merge refs are collected in
+    # the same pass and written as one block after the rows.
+    group_starts = set()
+    merges = []
+    r = 2
+    for row_count in group_row_counts:
+        if row_count > 0:
+            end = r + row_count - 1
+            group_starts.add(r)
+            merges.extend(f'<mergeCell ref="{letter}{r}:{letter}{end}"/>' for letter in letters[:merge_cols])
+            r = end + 1
+
+    for r, row in enumerate(rows, 2):
+        parts.append(f'<row r="{r}">')
+        first = r in group_starts
+        for col_idx, (letter, value) in enumerate(zip(letters, row)):
+            if col_idx < merge_cols:
+                if first:
+                    parts.append(_cell_xml(f"{letter}{r}", value, STYLE_CENTER))
+                continue
+            parts.append(_cell_xml(f"{letter}{r}", value))
+        parts.append("</row>")
+    parts.append("</sheetData>")
+
+    if merges:
+        parts.append(f'<mergeCells count="{len(merges)}">{"".join(merges)}</mergeCells>')
+
+    parts.append("</worksheet>")
+    return "".join(parts)
+
+
+def write_workbook(header, rows, group_row_counts, merge_cols, widths, title="Sheet1") -> bytes:
+    """Build a one-sheet .xlsx and return its bytes.
+
+    `rows` are value sequences in `header` order. The first `merge_cols`
+    columns are merged down each group's block of rows, using the counts in
+    `group_row_counts` (groups with 0 rows are skipped). Strings must already
+    be free of XML-illegal characters (see ILLEGAL_CHARACTERS_RE).
+    """
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES_XML)
+        zf.writestr("_rels/.rels", ROOT_RELS_XML)
+        zf.writestr("xl/workbook.xml", WORKBOOK_XML.format(title=escape(title, {'"': "&quot;"})))
+        zf.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS_XML)
+        zf.writestr("xl/styles.xml", STYLES_XML)
+        zf.writestr(
+            "xl/worksheets/sheet1.xml",
+            _sheet_xml(header, rows, group_row_counts, merge_cols, widths),
+        )
+    return output.getvalue()
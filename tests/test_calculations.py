@@ -0,0 +1,52 @@
+import app
+
+
+def test_calculate_columns_rules():
+    groups = [{"Start Aisle": 3, "End Aisle": 7, "# of Bays": "12"}, {}]
+    bins = [
+        {"Depth (mm)": 300, "Height (mm)": 100, "Width (mm)": 200, "Lip (cm)": 2.0,
+         "# of Shelves per Bay": 4, "Qty bins per Shelf": 6, "UT": 0.75},
+        {"Depth (mm)": "bad", "Height (mm)": None, "Width (mm)": "1_000", "Lip (cm)": 0,
+         "# of Shelves per Bay": 2.9, "Qty bins per Shelf": "", "UT": 0.5},
+        {},
+    ]
+    calc = app.calculate_columns(groups, [2, 1], bins)
+    assert calc["Lip (cm)"] == [2.0, "-", "-"]
+    assert calc["# of Aisles"] == [5, 5, 1]
+    assert calc["Qty Per Bay"] == [24, 2, 1]
+    assert calc["Total Quantity"] == [288, 24, 1]
+    assert calc["Bin Gross CBM"] == [6.0, 0.0, 0.0]
+    assert calc["Bin Net CBM"] == [4.5, 0.0, 0.0]
+
+
+def test_bin_readouts_use_calculate_columns(monkeypatch):
+    library = {
+        "bin_1": {"Depth (mm)": 123.4, "Height (mm)": 56.7, "Width (mm)": 89.1, "UT": 1 / 3},
+        "bin_2": {"Depth (mm)": "12", "Height (mm)": None, "Width (mm)": 5, "UT": 0.5},
+        "bin_3": {"Depth (mm)": 600, "Height (mm)": 250.5, "Width (mm)": 400, "UT": "0.75"},
+    }
+    calls = []
+    real = app.calculate_columns
+
+    def spy(*args):
+        calls.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(app, "calculate_columns", spy)
+    readouts = app.bin_readouts(library)
+
+    # One call for the whole library, with the bins as export rows
+    assert len(calls) == 1
+    expected = real([{}], [3], list(library.values()))
+    assert readouts == {
+        bin_id: (expected["Bin Gross CBM"][i], expected["Bin Net CBM"][i])
+        for i, bin_id in enumerate(library)
+    }
+    assert readouts["bin_3"] == (60.12, 45.09)
+
+
+def test_calculate_columns_coerces_like_safe_float():
+    values = [300, "1_000", "٣", " 2.5 ", "x", None, float("nan"), True]
+    bins = [{"Depth (mm)": v, "Height (mm)": 1_000, "Width (mm)": 1_000} for v in values]
+    gross = app.calculate_columns([{}], [len(bins)], bins)["Bin Gross CBM"]
+    assert [repr(v) for v in gross] == [repr(round(app.safe_float(v), 4)) for v in values]
@@ -0,0 +1,115 @@
+"""The fast_xlsx and openpyxl export paths must produce the same workbook."""
+import copy
+import io
+
+import pytest
+from openpyxl import load_workbook
+
+import app
+
+LIBRARY = {
+    "bin_1": {"Bin Box Type": "Small", "Depth (mm)": 300.0, "Height (mm)": 100.0, "Width (mm)": 200.0,
+              "Lip (cm)": 2.0, "# of Shelves per Bay": 4, "Qty bins per Shelf": 6, "UT": 0.75},
+    "bin_2": {"Bin Box Type": "Line\x0bbreak", "Depth (mm)": 0.1, "Height (mm)": 0.2, "Width (mm)": 1e6,
+              "Lip (cm)": 0.0, "# of Shelves per Bay": 2, "Qty bins per Shelf": 3, "UT": 1 / 3},
+    "bin_3": {"Bin Box Type": " padded ", "Depth (mm)": 0.0, "Height (mm)": 0.0, "Width (mm)": 0.0,
+              "Lip (cm)": 0.0, "# of Shelves per Bay": 1, "Qty bins per Shelf": 1, "UT": 0.0},
+}
+BIN_KEYS = [["bin_1", "bin_2", "bin_3"], ["bin_2"], [], ["bin_3", "missing", "bin_1"]]
+
+
+def make_groups(count):
+    return [
+        {
+            "group_data": {"Group Name": f"G{i}\x01", "Floor": "P1", "Mod": "A", "Depth": "D",
+                           "Start Aisle": 1 + i, "End Aisle": 5 + 2 * i, "# of Bays": 10 + i,
+                           "Total # of Shelves per Bay": 6, "Bay Design": "X"},
+            "bin_keys": list(BIN_KEYS[i % len(BIN_KEYS)]),
+            "finalized": False,
+        }
+        for i in range(count)
+    ]
+
+
+def read_back(data):
+    ws = load_workbook(io.BytesIO(data)).active
+    header = ws["A1"]
+    return {
+        "title": ws.title,
+        "freeze": ws.freeze_panes,
+        "rows": list(ws.iter_rows(values_only=True)),
+        "merges": sorted(str(r) for r in ws.merged_cells.ranges),
+        "widths": {k: v.width for k, v in ws.column_dimensions.items()},
+        "header_style": (header.font.b, header.fill.fgColor.rgb,
+                         header.alignment.horizontal, header.alignment.vertical),
+        "group_style": (ws["A2"].alignment.horizontal, ws["A2"].alignment.vertical),
+    }
+
+
+# One size below and one above the real FAST_XLSX_MIN_ROWS cut-off
+@pytest.mark.parametrize("group_count", [4, 400])
+def test_export_paths_match(monkeypatch, group_count):
+    groups = make_groups(group_count)
+
+    monkeypatch.setattr(app, "FAST_XLSX_MIN_ROWS", 10**9)
+    slow = read_back(app.generate_excel(groups, LIBRARY))
+    monkeypatch.setattr(app, "FAST_XLSX_MIN_ROWS", -1)
+    fast = read_back(app.generate_excel(groups, LIBRARY))
+
+    assert fast == slow
+    assert slow["header_style"] == (True, "FFD3D3D3", "center", "center")
+    assert slow["group_style"] == ("center", "center")
+    assert slow["rows"][0] == tuple(app.EXPORT_COLUMNS)
+    assert "A2:A4" in slow["merges"]
+
+
+def test_export_row_count_crosses_threshold():
+    columns, _ = app.build_spec_columns(make_groups(400), LIBRARY)
+    assert len(columns[0]) > app.FAST_XLSX_MIN_ROWS
+    columns, _ = app.build_spec_columns(make_groups(4), LIBRARY)
+    assert len(columns[0]) <= app.FAST_XLSX_MIN_ROWS
+
+
+def test_export_strips_illegal_characters():
+    rows = read_back(app.generate_excel(make_groups(2), LIBRARY))["rows"]
+    type_col = app.EXPORT_COLUMNS.index("Bin Box Type")
+    assert rows[1][0] == "G0"
+    assert rows[2][type_col] == "Linebreak"
+    assert rows[4][type_col] == "Linebreak"
+    assert rows[2][app.EXPORT_COLUMNS.index("UT")] == 1 / 3
+
+
+@pytest.fixture
+def session():
+    state = app.st.session_state
+    state.bin_library = copy.deepcopy(LIBRARY)
+    state.bin_library["unused"] = {"Bin Box Type": "Spare", "Depth (mm)": 1.0, "UT": 0.5}
+    state.groups = make_groups(4)
+    return state
+
+
+def test_export_from_snapshot_matches_direct_export(session):
+    app.excel_from_snapshot.clear()
+    from_snapshot = read_back(app.excel_from_snapshot(app.export_snapshot()))
+    direct = read_back(app.generate_excel(session.groups, session.bin_library))
+    assert from_snapshot == direct
+
+
+def test_snapshot_ignores_unused_bins(session):
+    before = app.export_snapshot()
+    session.bin_library["unused"]["Depth (mm)"] = 2.0
+    session.bin_library["new"] = {"Bin Box Type": "New"}
+    assert app.export_snapshot() == before
+
+
+@pytest.mark.parametrize("edit", [
+    lambda s: s.bin_library["bin_2"].update({"UT": 0.5}),
+    lambda s: s.groups[0]["group_data"].update({"Floor": "P2"}),
+    lambda s: s.groups[1]["group_data"].update({"# of Bays": 99}),
+    lambda s: s.groups[2]["bin_keys"].append("bin_1"),
+    lambda s: s.groups.pop(),
+])
+def test_snapshot_changes_with_used_data(session, edit):
+    before = app.export_snapshot()
+    edit(session)
+    assert app.export_snapshot() != before